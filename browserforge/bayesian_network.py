@@ -1,7 +1,23 @@
-import random
+import os
 import zipfile
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from itertools import accumulate
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, TypeVar, Union
+from random import random
+from typing import (
+    AbstractSet,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+)
 
 try:
     import orjson as json
@@ -10,6 +26,9 @@ except ImportError:
 
 T = TypeVar('T')
 Map = Union[list, tuple]
+# (values, cutoff probabilities, alias indices)
+AliasTable = Tuple[Tuple[str, ...], List[float], List[int]]
+EMPTY_ALIAS_TABLE: AliasTable = ((), [], [])
 
 
 class BayesianNode:
@@ -17,8 +36,28 @@ class BayesianNode:
     Implementation of a single node in a bayesian network allowing sampling from its conditional distribution
     """
 
+    __slots__ = (
+        'node_definition',
+        'name',
+        'parent_names',
+        'possible_values',
+        'alias_tree',
+        'alias_tables_by_parent_values',
+    )
+
     def __init__(self, node_definition: Dict[str, Any]):
         self.node_definition = node_definition
+        self.name: str = node_definition['name']
+        self.parent_names: Tuple[str, ...] = tuple(node_definition.get('parentNames', ()))
+        self.possible_values: Tuple[str, ...] = tuple(node_definition.get('possibleValues', ()))
+        # Alias tables mirroring the "deeper"/"skip" structure of the conditional probabilities
+        self.alias_tree = build_alias_tree(
+            node_definition['conditionalProbabilities'], len(self.parent_names)
+        )
+        # Flat index of the alias tables reachable without skipping, keyed by the parent values
+        self.alias_tables_by_parent_values: Dict[Tuple[Any, ...], AliasTable] = dict(
+            iter_deeper_alias_tables(self.alias_tree, len(self.parent_names))
+        )
 
     def get_probabilities_given_known_values(
         self, parent_values: Dict[str, Any]
@@ -41,25 +80,43 @@ class BayesianNode:
         """
         Randomly samples from the given values using the given probabilities
         """
-        # Python natively supports weighted random sampling in random.choices,
-        # but this method is much faster
-        anchor = random.random()
-        cumulative_probability = 0.0
-        for possible_value in possible_values:
-            cumulative_probability += probabilities[possible_value]
-            if cumulative_probability > anchor:
-                return possible_value
-        # Default to first item
-        return possible_values[0]
+        # Binary search over the cumulative probabilities of the possible values.
+        # The possible values may not cover the whole distribution, so scale the anchor by their total
+        cumulative_probabilities = list(
+            accumulate(probabilities[possible_value] for possible_value in possible_values)
+        )
+        total_probability = cumulative_probabilities[-1]
+        if not total_probability:
+            # Default to first item
+            return possible_values[0]
+        anchor = random() * total_probability
+        return possible_values[bisect_right(cumulative_probabilities, anchor)]
+
+    def get_alias_table_given_known_values(self, parent_values: Dict[str, Any]) -> AliasTable:
+        """
+        Extracts the alias table of the conditional distribution given the values of the parent nodes
+        """
+        # Single lookup when every parent value has its own branch
+        alias_table = self.alias_tables_by_parent_values.get(
+            tuple(map(parent_values.get, self.parent_names))
+        )
+        if alias_table is not None:
+            return alias_table
+        # Otherwise, walk the tree to find which "skip" branches apply
+        alias_tree = self.alias_tree
+        for parent_name in self.parent_names:
+            parent_value = parent_values.get(parent_name)
+            if parent_value in alias_tree.get('deeper', {}):
+                alias_tree = alias_tree['deeper'][parent_value]
+            else:
+                alias_tree = alias_tree.get('skip', {})
+        return alias_tree or EMPTY_ALIAS_TABLE
 
     def sample(self, parent_values: Dict[str, Any]) -> Any:
         """
         Randomly samples from the conditional distribution of this node given values of parents
         """
-        probabilities = self.get_probabilities_given_known_values(parent_values)
-        return self.sample_random_value_from_possibilities(
-            list(probabilities.keys()), probabilities
-        )
+        return sample_from_alias_table(self.get_alias_table_given_known_values(parent_values))
 
     def sample_according_to_restrictions(
         self,
@@ -70,6 +127,12 @@ class BayesianNode:
         """
         Randomly samples from the conditional distribution of this node given restrictions on the possible values and the values of the parents.
         """
+        if not banned_values and value_possibilities is self.possible_values:
+            # Nothing is restricted, so the cached values and alias table of the leaf can be used
+            alias_table = self.get_alias_table_given_known_values(parent_values)
+            if alias_table[0]:
+                return sample_from_alias_table(alias_table)
+            return None
         probabilities = self.get_probabilities_given_known_values(parent_values)
         valid_values = [
             value
@@ -81,18 +144,6 @@ class BayesianNode:
         else:
             return None  # Equivalent to `false` in TypeScript
 
-    @property
-    def name(self) -> str:
-        return self.node_definition['name']
-
-    @property
-    def parent_names(self) -> List[str]:
-        return self.node_definition.get('parentNames', [])
-
-    @property
-    def possible_values(self) -> List[str]:
-        return self.node_definition.get('possibleValues', [])
-
 
 class BayesianNetwork:
     """
@@ -106,16 +157,37 @@ class BayesianNetwork:
         ]
         self.nodes_by_name = {node.name: node for node in self.nodes_in_sampling_order}
 
+    @classmethod
+    def load_many(cls, paths: Dict[str, Path]) -> Dict[str, 'BayesianNetwork']:
+        """
+        Loads several networks concurrently.
+
+        Parameters:
+            paths: Mapping of keys to the paths of the network definitions.
+
+        Returns:
+            Mapping of the same keys to the loaded networks.
+        """
+        with ThreadPoolExecutor(min(len(paths), os.cpu_count() or 1) or 1) as executor:
+            futures = {key: executor.submit(cls, path) for key, path in paths.items()}
+            return {key: future.result() for key, future in futures.items()}
+
     def generate_sample(self, input_values: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Randomly samples from the distribution represented by the bayesian network.
         """
-        if input_values is None:
-            input_values = {}
-        sample = input_values.copy()
-        for node in self.nodes_in_sampling_order:
-            if node.name not in sample:
-                sample[node.name] = node.sample(sample)
+        if not input_values:
+            sample: Dict[str, Any] = {}
+            nodes = self.nodes_in_sampling_order
+        else:
+            sample = input_values.copy()
+            nodes = [node for node in self.nodes_in_sampling_order if node.name not in sample]
+        # Call the alias sampler directly rather than through BayesianNode.sample,
+        # saving a Python frame per node in the hottest loop of the generators
+        for node in nodes:
+            sample[node.name] = sample_from_alias_table(
+                node.get_alias_table_given_known_values(sample)
+            )
         return sample
 
     def generate_consistent_sample_when_possible(
@@ -126,78 +198,161 @@ class BayesianNetwork:
         making sure the sample is consistent with the provided restrictions on value possibilities.
         Returns None if no such sample can be generated.
         """
-        return self.recursively_generate_consistent_sample_when_possible({}, value_possibilities, 0)
-
-    def recursively_generate_consistent_sample_when_possible(
-        self,
-        sample_so_far: Dict[str, Any],
-        value_possibilities: Dict[str, Iterable[str]],
-        depth: int,
-    ) -> Optional[Dict[str, Any]]:
-        """
-        Recursively generates a random sample consistent with the given restrictions on possible values.
-        """
-        if depth == len(self.nodes_in_sampling_order):
-            return sample_so_far
-        node = self.nodes_in_sampling_order[depth]
-        banned_values: List[str] = []
-        sample_value = None
-        while True:
+        nodes = self.nodes_in_sampling_order
+        sample: Dict[str, Any] = {}
+        # Values that already led to a dead end, per depth
+        banned_values: List[List[str]] = [[] for _ in nodes]
+        depth = 0
+        while depth < len(nodes):
+            node = nodes[depth]
             sample_value = node.sample_according_to_restrictions(
-                sample_so_far,
+                sample,
                 value_possibilities.get(node.name, node.possible_values),
-                banned_values,
-            )
-            if sample_value is None:
-                break
-            sample_so_far[node.name] = sample_value
-            next_sample = self.recursively_generate_consistent_sample_when_possible(
-                sample_so_far, value_possibilities, depth + 1
+                banned_values[depth],
             )
-            if next_sample is not None:
-                return next_sample
-            banned_values.append(sample_value)
-            del sample_so_far[node.name]
-        return None
+            if sample_value is not None:
+                sample[node.name] = sample_value
+                depth += 1
+                continue
+            # No value is possible at this depth. Backtrack and ban the previous node's value
+            banned_values[depth].clear()
+            depth -= 1
+            if depth < 0:
+                return None
+            banned_values[depth].append(sample.pop(nodes[depth].name))
+        return sample
 
 
-def array_intersection(a: Sequence[T], b: Sequence[T]) -> List[T]:
+def build_alias_table(probabilities: Dict[str, float]) -> AliasTable:
+    """
+    Builds the tables for sampling from a discrete distribution with Walker's alias method
+    """
+    values = tuple(probabilities.keys())
+    size = len(values)
+    total = sum(probabilities.values())
+    if not total:
+        # Nothing to weigh by. Default to the first item
+        return values, [0.0] * size, [0] * size
+    scaled = [probabilities[value] * size / total for value in values]
+    cutoffs = [1.0] * size
+    aliases = list(range(size))
+    small = [i for i, p in enumerate(scaled) if p < 1.0]
+    large = [i for i, p in enumerate(scaled) if p >= 1.0]
+    while small and large:
+        poor, rich = small.pop(), large.pop()
+        cutoffs[poor] = scaled[poor]
+        aliases[poor] = rich
+        scaled[rich] -= 1.0 - scaled[poor]
+        (small if scaled[rich] < 1.0 else large).append(rich)
+    # Anything left over is within floating point error of 1.0
+    return values, cutoffs, aliases
+
+
+def sample_from_alias_table(alias_table: AliasTable) -> Any:
+    """
+    Randomly samples a value from an alias table in O(1)
+    """
+    values, cutoffs, aliases = alias_table
+    # A single draw picks the column with its integer part and the side with its fraction
+    anchor = random() * len(values)
+    index = int(anchor)
+    if anchor - index < cutoffs[index]:
+        return values[index]
+    return values[aliases[index]]
+
+
+def build_alias_tree(probabilities: Dict[str, Any], depth: int) -> Any:
+    """
+    Replaces the leaves of a conditional probability table with their alias tables
+    """
+    if depth == 0:
+        return build_alias_table(probabilities)
+    tree: Dict[str, Any] = {}
+    if 'deeper' in probabilities:
+        tree['deeper'] = {
+            key: build_alias_tree(value, depth - 1)
+            for key, value in probabilities['deeper'].items()
+        }
+    if 'skip' in probabilities:
+        tree['skip'] = build_alias_tree(probabilities['skip'], depth - 1)
+    return tree
+
+
+def iter_deeper_alias_tables(
+    alias_tree: Any, depth: int
+) -> Iterator[Tuple[Tuple[str, ...], AliasTable]]:
+    """
+    Yields the alias tables of an alias tree that are reachable through "deeper" branches only,
+    along with the parent values leading to them
+    """
+    if depth == 0:
+        yield (), alias_tree
+        return
+    for parent_value, subtree in alias_tree.get('deeper', {}).items():
+        for parent_values, alias_table in iter_deeper_alias_tables(subtree, depth - 1):
+            yield (parent_value, *parent_values), alias_table
+
+
+def array_intersection(a: Sequence[T], b: Union[Sequence[T], AbstractSet[T]]) -> List[T]:
     """
     Performs a set "intersection" on the given (flat) arrays
     """
-    set_b = set(b)
-    return [x for x in a if x in set_b]
+    set_b = b if isinstance(b, (set, frozenset)) else frozenset(b)
+    return list(filter(set_b.__contains__, a))
 
 
 def array_zip(a: List[Tuple[T, ...]], b: List[Tuple[T, ...]]) -> List[Tuple[T, ...]]:
     """
-    Combines two arrays into a single array using the set union
+    Combines two arrays into a single array using the (order preserving) set union
     Args:
         a: First array to be combined.
         b: Second array to be combined.
     Returns:
         Zipped (multi-dimensional) array.
     """
-    return [tuple(set(x).union(y)) for x, y in zip(a, b)]
+    return [tuple(dict.fromkeys(x + y)) for x, y in zip(a, b)]
 
 
 def undeeper(obj: Dict[str, Any]) -> Dict[str, Any]:
     """
     Removes the "deeper/skip" structures from the conditional probability table
     """
-    if not isinstance(obj, dict):
+    if not isinstance(obj, dict) or _is_leaf(obj):
         return obj
     result: Dict[str, Any] = {}
-    for key, value in obj.items():
-        if key == 'skip':
-            continue
-        if key == 'deeper':
-            result.update(undeeper(value))
+    # Explicit DFS over (items left to visit, output dict) instead of recursing per level
+    stack: List[Tuple[Iterator[Tuple[str, Any]], Dict[str, Any]]] = [(iter(obj.items()), result)]
+    while stack:
+        items, output = stack[-1]
+        for key, value in items:
+            if key == 'skip':
+                continue
+            if key == 'deeper':
+                # Merge the children into the current output
+                if isinstance(value, dict):
+                    stack.append((iter(value.items()), output))
+                    break
+                continue
+            if not isinstance(value, dict) or _is_leaf(value):
+                # Leaves hold no structures to remove and can be shared as-is
+                output[key] = value
+                continue
+            child: Dict[str, Any] = {}
+            output[key] = child
+            stack.append((iter(value.items()), child))
+            break
         else:
-            result[key] = undeeper(value)
+            stack.pop()
     return result
 
 
+def _is_leaf(obj: Dict[str, Any]) -> bool:
+    """
+    Checks if a dict holds no nested dicts
+    """
+    return not any(isinstance(value, dict) for value in obj.values())
+
+
 def filter_by_last_level_keys(tree: Dict[str, Any], valid_keys: Map) -> List[Tuple[str, ...]]:
     r"""
     Performs DFS on the Tree and returns values of the nodes on the paths that end with the given keys
@@ -211,24 +366,27 @@ def filter_by_last_level_keys(tree: Dict[str, Any], valid_keys: Map) -> List[Tup
     ```
     filter_by_last_level_keys(tree, ['4', '7']) => [[1], [2,3]]
     """
-    out: List[Tuple[str, ...]] = []
+    # Values seen on each level, merged in place. Dicts are used as ordered sets
+    out: List[Dict[str, None]] = []
 
     def recurse(t: Dict[str, Any], vk: Union[Tuple[str, ...], List[str]], acc: List[str]) -> None:
-        for key in t.keys():
-            if not isinstance(t[key], dict) or t[key] is None:
+        nonlocal out
+        for key, value in t.items():
+            if not isinstance(value, dict) or value is None:
                 if key in vk:
-                    nonlocal out
-                    out = (
-                        [(x,) for x in acc]
-                        if len(out) == 0
-                        else array_zip(out, [(x,) for x in acc])
-                    )
+                    if not out:
+                        out = [{x: None} for x in acc]
+                    else:
+                        # Zipping drops the levels past the shortest path
+                        del out[len(acc) :]
+                        for level, x in zip(out, acc):
+                            level[x] = None
                 continue
             else:
-                recurse(t[key], vk, acc + [key])
+                recurse(value, vk, acc + [key])
 
     recurse(tree, valid_keys, [])
-    return out
+    return [tuple(level) for level in out]
 
 
 def get_possible_values(
@@ -287,10 +445,19 @@ def extract_json(path: Path) -> dict:
     # Unzip the file and load the JSON content
     with zipfile.ZipFile(path, 'r') as zf:
         # Find the first JSON file in zip
-        try:
-            filename = next(file for file in zf.namelist() if file.endswith('.json'))
-        except StopIteration:
+        info = next((info for info in zf.infolist() if info.filename.endswith('.json')), None)
+        if info is None:
             return {}  # Broken
-        with zf.open(filename) as f:
-            # Assuming only one JSON file is needed
-            return json.loads(f.read())
+        # Decompress straight into a buffer of the final size to avoid joining chunks
+        buffer = bytearray(info.file_size)
+        read = 0
+        with zf.open(info) as f, memoryview(buffer) as view:
+            while read < info.file_size:
+                # ZipExtFile is typed as IO[bytes], but it is a BufferedIOBase with readinto
+                chunk_size = f.readinto(view[read:])  # type: ignore[attr-defined]
+                if not chunk_size:
+                    break
+                read += chunk_size
+        del buffer[read:]
+        # Assuming only one JSON file is needed
+        return json.loads(buffer)
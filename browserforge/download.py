@@ -1,11 +1,11 @@
-import shutil
+import os
+import time
+import urllib.error
 import urllib.request
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from datetime import datetime, timedelta
+from email.message import Message
 from pathlib import Path
-from typing import Dict, Iterator
-
-import click
+from typing import Dict, Iterator, Optional, Set, Tuple, Union
 
 """
 Downloads the required model definitions
@@ -30,10 +30,33 @@ DATA_FILES: Dict[str, Dict[str, str]] = {
         "fingerprint-network.zip": "fingerprint-network-definition.zip",
     },
 }
+# Point straight at the raw content host. github.com/.../raw/... only redirects there,
+# costing an extra connection and TLS handshake per file
 REMOTE_PATHS: Dict[str, str] = {
-    "headers": "https://github.com/apify/fingerprint-suite/raw/master/packages/header-generator/src/data_files",
-    "fingerprints": "https://github.com/apify/fingerprint-suite/raw/master/packages/fingerprint-generator/src/data_files",
+    "headers": "https://raw.githubusercontent.com/apify/fingerprint-suite/master/packages/header-generator/src/data_files",
+    "fingerprints": "https://raw.githubusercontent.com/apify/fingerprint-suite/master/packages/fingerprint-generator/src/data_files",
+}
+# (local name, url, local path) of every data file, by data type
+DOWNLOAD_PLAN: Dict[str, Tuple[Tuple[str, str, str], ...]] = {
+    data_type: tuple(
+        (
+            local_name,
+            f"{REMOTE_PATHS[data_type]}/{remote_name}",
+            str(DATA_DIRS[data_type] / local_name),
+        )
+        for local_name, remote_name in files.items()
+    )
+    for data_type, files in DATA_FILES.items()
 }
+# Data files older than this are downloaded again (5 weeks, in seconds)
+MAX_FILE_AGE: int = 5 * 7 * 24 * 60 * 60
+# Seconds a blocking socket operation may take before a download is aborted
+DOWNLOAD_TIMEOUT: float = 120.0
+# Files larger than this are fetched as parallel byte ranges of this size
+DOWNLOAD_PART_SIZE: int = 256 * 1024
+MAX_PARALLEL_PARTS: int = 4
+# Data types already found to be downloaded by this process
+_downloaded: Set[str] = set()
 
 
 class DownloadException(Exception):
@@ -52,32 +75,123 @@ class DataDownloader:
         """
         Download a file from the specified URL and save it to the given path.
         """
-        with urllib.request.urlopen(url) as resp:  # nosec
-            if resp.status != 200:
+        data = self._download(url)
+        # The data files are small, so buffer the body and write it in a single call.
+        # This also avoids leaving a truncated file behind if the transfer fails midway
+        Path(path).write_bytes(data)
+
+    def _download(self, url: str) -> Union[bytes, bytearray]:
+        """
+        Download a file, fetching larger files as parallel byte ranges.
+        Falls back to a plain full request whenever the ranges can't be trusted.
+        """
+        # Request the first part as a range. Small files arrive whole,
+        # and the response tells the total size of larger ones
+        try:
+            status, headers, data = self._fetch(url, {'Range': f'bytes=0-{DOWNLOAD_PART_SIZE - 1}'})
+        except urllib.error.HTTPError as e:
+            if e.code != 416:
+                raise
+            # Range Not Satisfiable, as for an empty file. Request the file as it is
+            return self._fetch(url)[2]
+        if status == 200:
+            # The server ignored the range and sent the whole file
+            return data
+        total_size = _get_total_size(headers.get('Content-Range'))
+        etag = headers.get('ETag')
+        # Without a total size the file can't be split, and without a strong ETag
+        # the parts can't be pinned to the same version of the file
+        if total_size is None or not etag or etag.startswith('W/') or len(data) > total_size:
+            return self._fetch(url)[2]
+        if total_size == len(data):
+            return data
+        buffer = self._fetch_remaining_parts(url, data, total_size, etag)
+        if buffer is None:
+            # The server sent an unexpected range
+            return self._fetch(url)[2]
+        return buffer
+
+    def _fetch_remaining_parts(
+        self, url: str, first_part: bytes, total_size: int, etag: str
+    ) -> Optional[Union[bytes, bytearray]]:
+        """
+        Fetch the rest of a file in parallel byte ranges after its first part.
+        If the file changed upstream, returns the whole new file the server sent instead.
+        Returns None if any part can't be trusted to belong to the same version of the file.
+        """
+        buffer = bytearray(total_size)
+        buffer[: len(first_part)] = first_part
+        ranges = [
+            (start, min(start + DOWNLOAD_PART_SIZE, total_size) - 1)
+            for start in range(len(first_part), total_size, DOWNLOAD_PART_SIZE)
+        ]
+        with ThreadPoolExecutor(min(len(ranges), MAX_PARALLEL_PARTS)) as executor:
+            parts = executor.map(
+                # If-Range makes the server send the whole new file instead of a range
+                # if the file no longer matches the ETag of the first part
+                lambda byte_range: self._fetch(
+                    url, {'Range': f'bytes={byte_range[0]}-{byte_range[1]}', 'If-Range': etag}
+                ),
+                ranges,
+            )
+            for (start, end), (status, headers, part) in zip(ranges, parts):
+                if status == 200:
+                    # The If-Range check failed, so this is the whole new file
+                    return part
+                if (
+                    status != 206
+                    or headers.get('Content-Range') != f'bytes {start}-{end}/{total_size}'
+                    or headers.get('ETag') not in (None, etag)
+                    or len(part) != end - start + 1
+                ):
+                    return None
+                buffer[start : end + 1] = part
+        return buffer
+
+    def _fetch(
+        self, url: str, headers: Optional[Dict[str, str]] = None
+    ) -> Tuple[int, Message, bytes]:
+        """
+        Request a file, or a byte range of it. Servers that ignore ranges will return the whole file.
+        """
+        request = urllib.request.Request(url, headers=headers or {})
+        with urllib.request.urlopen(request, timeout=DOWNLOAD_TIMEOUT) as resp:  # nosec
+            if resp.status not in (200, 206):
                 raise DownloadException(f"Download failed with status code: {resp.status}")
-            with open(path, "wb") as f:
-                shutil.copyfileobj(resp, f)
+            return resp.status, resp.headers, resp.read()
 
     def download(self) -> None:
         """
         Download and extract data files for both headers and fingerprints.
         """
+        import click
+
         futures = {}
-        with ThreadPoolExecutor(10) as executor:
-            for data_type in self.options:
-                for local_name, remote_name in DATA_FILES[data_type].items():
-                    url = f"{REMOTE_PATHS[data_type]}/{remote_name}"
-                    path = str(DATA_DIRS[data_type] / local_name)
-                    future = executor.submit(self.download_file, url, path)
-                    futures[future] = local_name
-            for f in as_completed(futures):
+        downloads = [file for data_type in self.options for file in DOWNLOAD_PLAN[data_type]]
+        # One worker per file so every download runs in parallel
+        with ThreadPoolExecutor(max(len(downloads), 1)) as executor:
+            for local_name, url, path in downloads:
+                future = executor.submit(self.download_file, url, path)
+                futures[future] = local_name
+            for future in as_completed(futures):
+                local_name = futures[future]
                 try:
                     future.result()
-                    click.secho(f"{futures[f]:<30}OK!", fg="green")
+                    click.secho(f"{local_name:<30}OK!", fg="green")
                 except Exception as e:
                     click.secho(f"Error downloading {local_name}: {e}", fg="red")
 
 
+def _get_total_size(content_range: Optional[str]) -> Optional[int]:
+    """
+    Parses the total size out of a Content-Range header (`bytes 0-1023/4096`)
+    """
+    if not content_range:
+        return None
+    total_size = content_range.rpartition('/')[2]
+    return int(total_size) if total_size.isdigit() else None
+
+
 def _enabled_flags(flags: Dict[str, bool]) -> Iterator[str]:
     """
     Returns a list of enabled flags based on a given dictionary
@@ -97,6 +211,10 @@ def _get_all_paths(**flags: bool) -> Iterator[Path]:
             yield data_path / local_name
 
 
+# Every data file
+ALL_PATHS: Tuple[Path, ...] = tuple(_get_all_paths(headers=True, fingerprints=True))
+
+
 """
 Public download functions
 """
@@ -106,6 +224,9 @@ def Download(headers=False, fingerprints=False) -> None:
     """
     Download the required data files
     """
+    # Imported here to keep click off the import path of the generators
+    import click
+
     # Announce that files are being downloaded
     click.secho('Downloading model definition files...', fg='bright_yellow')
     try:
@@ -120,8 +241,14 @@ def DownloadIfNotExists(**flags: bool) -> None:
     """
     Download the required data files if they don't exist
     """
-    if not IsDownloaded(**flags):
-        Download(**flags)
+    requested = set(_enabled_flags(flags))
+    # Only stat the files the first time each data type is requested
+    if requested <= _downloaded:
+        return
+    if IsDownloaded(**flags):
+        _downloaded.update(requested)
+        return
+    Download(**flags)
 
 
 def IsDownloaded(**flags: bool) -> bool:
@@ -129,19 +256,30 @@ def IsDownloaded(**flags: bool) -> bool:
     Check if the required data files are already downloaded and not older than a month.
     Returns True if all the requested data files are present and not older than a month, False otherwise.
     """
-    for path in _get_all_paths(**flags):
-        if not path.exists():
+    cutoff = time.time() - MAX_FILE_AGE
+    for data_type in _enabled_flags(flags):
+        # One directory listing per data type instead of a stat call per file
+        try:
+            with os.scandir(DATA_DIRS[data_type]) as it:
+                entries = {entry.name: entry for entry in it}
+        except FileNotFoundError:
             return False
-
-    # Check if the file is older than a month
-    file_creation_time = datetime.fromtimestamp(path.stat().st_ctime)
-    one_month_ago = datetime.now() - timedelta(weeks=5)
-    return file_creation_time >= one_month_ago
+        for local_name in DATA_FILES[data_type]:
+            entry = entries.get(local_name)
+            # st_mtime is the time the file was written on every platform,
+            # unlike st_ctime (metadata change time on Unix)
+            if entry is None or entry.stat().st_mtime < cutoff:
+                return False
+    return True
 
 
 def Remove() -> None:
     """
     Deletes all downloaded data files
     """
-    for path in _get_all_paths(headers=True, fingerprints=True):
-        path.unlink(missing_ok=True)
+    _downloaded.clear()
+    for path in ALL_PATHS:
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
@@ -1,9 +1,18 @@
-from dataclasses import asdict, dataclass
+import os
+import random
+import threading
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from itertools import repeat
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple, Type
 
 from browserforge.bayesian_network import BayesianNetwork, get_possible_values
+from browserforge.download import DownloadIfNotExists
 from browserforge.headers import HeaderGenerator
+from browserforge.headers.generator import MISSING_VALUE_DATASET_TOKEN
 from browserforge.headers.utils import get_user_agent
 
 try:
@@ -16,10 +25,37 @@ except ImportError:
     USE_ORJSON = False
 
 DATA_DIR: Path = Path(__file__).parent / 'data'
+# Prefix of the object/array-like values packed into strings in the network
+STRINGIFIED_PREFIX = '*STRINGIFIED*'
+STRINGIFIED_PREFIX_LENGTH = len(STRINGIFIED_PREFIX)
+# Held while the network is loaded, see FingerprintGenerator._load_network
+_network_lock = threading.Lock()
 
 
 @dataclass
 class ScreenFingerprint:
+    __slots__ = (
+        'availHeight',
+        'availWidth',
+        'availTop',
+        'availLeft',
+        'colorDepth',
+        'height',
+        'pixelDepth',
+        'width',
+        'devicePixelRatio',
+        'pageXOffset',
+        'pageYOffset',
+        'innerHeight',
+        'outerHeight',
+        'outerWidth',
+        'innerWidth',
+        'screenX',
+        'clientWidth',
+        'clientHeight',
+        'hasHDR',
+    )
+
     availHeight: int
     availWidth: int
     availTop: int
@@ -43,6 +79,28 @@ class ScreenFingerprint:
 
 @dataclass
 class NavigatorFingerprint:
+    __slots__ = (
+        'userAgent',
+        'userAgentData',
+        'doNotTrack',
+        'appCodeName',
+        'appName',
+        'appVersion',
+        'oscpu',
+        'webdriver',
+        'language',
+        'languages',
+        'platform',
+        'deviceMemory',
+        'hardwareConcurrency',
+        'product',
+        'productSub',
+        'vendor',
+        'vendorSub',
+        'maxTouchPoints',
+        'extraProperties',
+    )
+
     userAgent: str
     userAgentData: Dict[str, str]
     doNotTrack: Optional[str]
@@ -66,6 +124,8 @@ class NavigatorFingerprint:
 
 @dataclass
 class VideoCard:
+    __slots__ = ('renderer', 'vendor')
+
     renderer: str
     vendor: str
 
@@ -74,6 +134,21 @@ class VideoCard:
 class Fingerprint:
     """Output data of the fingerprint generator"""
 
+    __slots__ = (
+        'screen',
+        'navigator',
+        'headers',
+        'videoCodecs',
+        'audioCodecs',
+        'pluginsData',
+        'battery',
+        'videoCard',
+        'multimediaDevices',
+        'fonts',
+        'mockWebRTC',
+        'slim',
+    )
+
     screen: ScreenFingerprint
     navigator: NavigatorFingerprint
     headers: Dict[str, str]
@@ -92,10 +167,13 @@ class Fingerprint:
         Dumps the dataclass as a JSON string.
         """
         if USE_ORJSON:
+            # orjson serializes dataclasses natively
             return json.dumps(self).decode()
-        # Built-in `json` does not take dataclass objects
-        # Instead, convert to a dict first
-        return json.dumps(asdict(self))
+        _warn_stdlib_json()
+        # Built-in `json` does not take dataclass objects.
+        # Hand it each dataclass's fields as they are encountered instead of deep copying with `asdict`.
+        # Compact separators match orjson's output and keep the injected script small
+        return json.dumps(self, default=_dataclass_fields, separators=(',', ':'))
 
 
 @dataclass
@@ -122,13 +200,19 @@ class Screen:
         """
         Returns true if any constraints were set
         """
-        return any(value is not None for value in self.__dict__.values())
+        return (
+            self.min_width is not None
+            or self.max_width is not None
+            or self.min_height is not None
+            or self.max_height is not None
+        )
 
 
 class FingerprintGenerator:
     """Generates realistic browser fingerprints"""
 
-    fingerprint_generator_network = BayesianNetwork(DATA_DIR / "fingerprint-network.zip")
+    # Loaded by the first generator created, see _load_network
+    fingerprint_generator_network: BayesianNetwork
 
     def __init__(
         self,
@@ -148,7 +232,10 @@ class FingerprintGenerator:
             slim (bool, optional): Disables performance-heavy evasions when injecting the fingerprint. Default is False.
             **header_kwargs: Header generation options for HeaderGenerator
         """
+        self._load_network()
         self.header_generator: HeaderGenerator = HeaderGenerator(**header_kwargs)
+        # Kept to rebuild the generator in generate_many's worker processes
+        self.header_kwargs: Dict[str, Any] = header_kwargs
 
         # Set default options
         self.screen: Optional[Screen] = screen
@@ -156,6 +243,24 @@ class FingerprintGenerator:
         self.mock_webrtc: bool = mock_webrtc
         self.slim: bool = slim
 
+    @classmethod
+    def _load_network(cls) -> None:
+        """
+        Downloads the fingerprint network if needed and loads it once for all generators.
+        Deferred until here so importing the package doesn't touch the disk or the network.
+        """
+        if hasattr(cls, 'fingerprint_generator_network'):
+            return
+        # Other threads creating generators wait for the first load instead of starting their own
+        with _network_lock:
+            if hasattr(cls, 'fingerprint_generator_network'):
+                return
+            DownloadIfNotExists(fingerprints=True)
+            # Set on the base class, so subclasses share the same network
+            FingerprintGenerator.fingerprint_generator_network = BayesianNetwork(
+                DATA_DIR / "fingerprint-network.zip"
+            )
+
     def generate(
         self,
         *,
@@ -199,39 +304,45 @@ class FingerprintGenerator:
             raise ValueError("Failed to find User-Agent in generated response")
 
         # Generate fingerprint consistent with the generated user agent
-        while True:
-            fingerprint: Optional[Dict] = (
-                self.fingerprint_generator_network.generate_consistent_sample_when_possible(
-                    {**filtered_values, 'userAgent': (user_agent,)}
-                )
+        fingerprint: Optional[Dict] = (
+            self.fingerprint_generator_network.generate_consistent_sample_when_possible(
+                {**filtered_values, 'userAgent': (user_agent,)}
             )
-            if fingerprint is not None:
-                break
+        )
+        if fingerprint is None:
             # Raise
             if strict:
                 raise ValueError(
                     'Cannot generate headers. User-Agent may be invalid, or screen constraints are too restrictive.'
                 )
-            # If no fingerprint was generated, relax the filtered values.
+            # If no fingerprint was generated, relax the filtered values once.
             # This seems to be an issue with some Mac and Linux systems
-            filtered_values = {}
+            if filtered_values:
+                fingerprint = (
+                    self.fingerprint_generator_network.generate_consistent_sample_when_possible(
+                        {'userAgent': (user_agent,)}
+                    )
+                )
+            # The search is exhaustive, so retrying the same inputs can't succeed
+            if fingerprint is None:
+                raise ValueError(
+                    'Cannot generate a fingerprint consistent with the generated User-Agent.'
+                )
 
         # Delete any missing attributes and unpack any object/array-like attributes
         # that have been packed together to make the underlying network simpler
-        for attribute in list(fingerprint.keys()):
-            if fingerprint[attribute] == '*MISSING_VALUE*':
+        for attribute, value in fingerprint.items():
+            if value == MISSING_VALUE_DATASET_TOKEN:
                 fingerprint[attribute] = None
-            if isinstance(fingerprint[attribute], str) and fingerprint[attribute].startswith(
-                '*STRINGIFIED*'
-            ):
-                fingerprint[attribute] = json.loads(fingerprint[attribute][len('*STRINGIFIED*') :])
+            elif isinstance(value, str) and value.startswith(STRINGIFIED_PREFIX):
+                fingerprint[attribute] = json.loads(value[STRINGIFIED_PREFIX_LENGTH:])
 
         # Manually add the set of accepted languages required by the input
         accept_language_header_value = headers.get('Accept-Language', '')
-        accepted_languages = [
-            locale.split(';', 1)[0] for locale in accept_language_header_value.split(',')
+        # partition doesn't build a list just to take its first item
+        fingerprint['languages'] = [
+            locale.partition(';')[0] for locale in accept_language_header_value.split(',')
         ]
-        fingerprint['languages'] = accepted_languages
 
         return self._transform_fingerprint(
             fingerprint,
@@ -240,6 +351,45 @@ class FingerprintGenerator:
             _first(slim, self.slim),
         )
 
+    def generate_many(
+        self, count: int, *, workers: Optional[int] = None, **generate_kwargs
+    ) -> List[Fingerprint]:
+        """
+        Generates multiple fingerprints in parallel worker processes.
+        Each worker loads the networks once, then generates its share of the fingerprints.
+
+        Parameters:
+            count (int): Number of fingerprints to generate.
+            workers (int, optional): Number of worker processes. Defaults to the number of CPUs.
+            **generate_kwargs: Options passed to FingerprintGenerator.generate for every fingerprint.
+
+        Returns:
+            List[Fingerprint]: Generated fingerprints.
+        """
+        workers = min(workers or os.cpu_count() or 1, count)
+        if workers < 2:
+            return [self.generate(**generate_kwargs) for _ in range(count)]
+        # Send the constructor options rather than the generator itself,
+        # so only plain option values need to be picklable
+        options = {
+            'screen': self.screen,
+            'strict': self.strict,
+            'mock_webrtc': self.mock_webrtc,
+            'slim': self.slim,
+            **self.header_kwargs,
+        }
+        with ProcessPoolExecutor(
+            workers, initializer=_init_worker, initargs=(type(self), options)
+        ) as executor:
+            return list(
+                executor.map(
+                    _generate_in_worker,
+                    repeat(generate_kwargs, count),
+                    # Send work in a few large batches rather than one task per fingerprint
+                    chunksize=max(count // (workers * 4), 1),
+                )
+            )
+
     def partial_csp(
         self, strict: Optional[bool], screen: Optional[Screen], filtered_values: Dict
     ) -> Optional[Dict]:
@@ -258,47 +408,94 @@ class FingerprintGenerator:
         if not (screen and screen.is_set()):
             return None
 
-        filtered_values['screen'] = [
-            screen_string
-            for screen_string in self.fingerprint_generator_network.nodes_by_name[
-                'screen'
-            ].possible_values
-            if self._is_screen_within_constraints(screen_string, screen)
-        ]
+        filtered_values['screen'] = self._get_screens_within_constraints(
+            screen.min_width, screen.max_width, screen.min_height, screen.max_height
+        )
 
         try:
-            return get_possible_values(self.fingerprint_generator_network, filtered_values)
+            # Copied, so callers can't alter the cached result. Its values are tuples already
+            return dict(self._get_possible_values(tuple(filtered_values.items())))
         except Exception as e:
             if strict:
                 raise e
             del filtered_values['screen']
         return None
 
-    @staticmethod
-    def _is_screen_within_constraints(screen_string: str, screen_options: Screen) -> bool:
+    @classmethod
+    @lru_cache(maxsize=128)
+    def _get_possible_values(
+        cls, filtered_values: Tuple[Tuple[str, Tuple[str, ...]], ...]
+    ) -> Dict[str, Tuple[str, ...]]:
         """
-        Checks if the given screen dimensions are within the specified constraints.
+        Returns the possible values induced by the filtered values.
+        Results are cached, since the filtered screens are the same for repeated constraints.
+        The values are stored as tuples, so the cached result can't be altered through them.
 
         Parameters:
-            screen_string (str): Stringified screen dimensions.
-            screen_options (Screen): Screen constraint options.
+            filtered_values (Tuple[Tuple[str, Tuple[str, ...]], ...]): Items of the filtered values.
 
         Returns:
-            bool: True if the screen dimensions are within the constraints, False otherwise.
+            Dict[str, Tuple[str, ...]]: Possible values of each node.
         """
-        try:
-            screen = json.loads(screen_string[len('*STRINGIFIED*') :])
-            return (
-                # Ensure that the screen width/height are greater than the minimum constraints
-                # Default missing values to -1 to ensure they are excluded
-                screen.get('width', -1) >= (screen_options.min_width or 0)
-                and screen.get('height', -1) >= (screen_options.min_height or 0)
-                # Ensure that the screen width/height are less than the maximum constraints
-                and screen.get('width', 0) <= (screen_options.max_width or 1e5)
-                and screen.get('height', 0) <= (screen_options.max_height or 1e5)
-            )
-        except (ValueError, TypeError):
-            return False
+        possible_values = get_possible_values(
+            cls.fingerprint_generator_network, dict(filtered_values)
+        )
+        return {key: tuple(values) for key, values in possible_values.items()}
+
+    @classmethod
+    @lru_cache(maxsize=128)
+    def _get_screens_within_constraints(
+        cls,
+        min_width: Optional[int],
+        max_width: Optional[int],
+        min_height: Optional[int],
+        max_height: Optional[int],
+    ) -> Tuple[str, ...]:
+        """
+        Returns the possible screen values within the given constraints.
+        Results are cached, since the same constraints are usually passed on every call.
+
+        Parameters:
+            min_width (Optional[int]): Minimum screen width.
+            max_width (Optional[int]): Maximum screen width.
+            min_height (Optional[int]): Minimum screen height.
+            max_height (Optional[int]): Maximum screen height.
+
+        Returns:
+            Tuple[str, ...]: Stringified screen values within the constraints.
+        """
+        # Resolve the bounds once instead of for every screen. Missing bounds are left open
+        lowest_width, highest_width = min_width or 0, max_width or 1e5
+        lowest_height, highest_height = min_height or 0, max_height or 1e5
+        return tuple(
+            screen_string
+            for screen_string, width, height in cls._get_parsed_screens()
+            if lowest_width <= width <= highest_width and lowest_height <= height <= highest_height
+        )
+
+    @classmethod
+    @lru_cache(maxsize=None)
+    def _get_parsed_screens(cls) -> Tuple[Tuple[str, float, float], ...]:
+        """
+        Parses the possible screen values of the network once, so constraints are checked against
+        their dimensions rather than decoding every value again.
+
+        Returns:
+            Tuple[Tuple[str, float, float], ...]: Stringified screen values with their width and height.
+        """
+        parsed_screens = []
+        for screen_string in cls.fingerprint_generator_network.nodes_by_name[
+            'screen'
+        ].possible_values:
+            try:
+                screen = json.loads(screen_string[STRINGIFIED_PREFIX_LENGTH:])
+                width, height = screen['width'], screen['height']
+            except (ValueError, TypeError, KeyError):
+                # Screens without dimensions can't be within any constraints
+                continue
+            if isinstance(width, (int, float)) and isinstance(height, (int, float)):
+                parsed_screens.append((screen_string, width, height))
+        return tuple(parsed_screens)
 
     @staticmethod
     def _transform_fingerprint(
@@ -317,36 +514,32 @@ class FingerprintGenerator:
             Fingerprint: Transformed fingerprint as a Fingerprint dataclass instance.
         """
 
-        navigator_kwargs = {
-            k: fingerprint[k]
-            for k in (
-                'userAgent',
-                'userAgentData',
-                'doNotTrack',
-                'appCodeName',
-                'appName',
-                'appVersion',
-                'oscpu',
-                'webdriver',
-                'platform',
-                'deviceMemory',
-                'product',
-                'productSub',
-                'vendor',
-                'vendorSub',
-                'extraProperties',
-                'hardwareConcurrency',
-                'languages',
-            )
-        }
-
-        # Always take the first element for 'language'
-        navigator_kwargs['language'] = navigator_kwargs['languages'][0]
-        navigator_kwargs['maxTouchPoints'] = fingerprint.get('maxTouchPoints', 0)
-
+        languages = fingerprint['languages']
         return Fingerprint(
             screen=ScreenFingerprint(**fingerprint['screen']),
-            navigator=NavigatorFingerprint(**navigator_kwargs),
+            # Built positionally in field order, without an intermediate kwargs dict
+            navigator=NavigatorFingerprint(
+                fingerprint['userAgent'],
+                fingerprint['userAgentData'],
+                fingerprint['doNotTrack'],
+                fingerprint['appCodeName'],
+                fingerprint['appName'],
+                fingerprint['appVersion'],
+                fingerprint['oscpu'],
+                fingerprint['webdriver'],
+                # Always take the first element for 'language'
+                languages[0],
+                languages,
+                fingerprint['platform'],
+                fingerprint['deviceMemory'],
+                fingerprint['hardwareConcurrency'],
+                fingerprint['product'],
+                fingerprint['productSub'],
+                fingerprint['vendor'],
+                fingerprint['vendorSub'],
+                fingerprint.get('maxTouchPoints', 0),
+                fingerprint['extraProperties'],
+            ),
             headers=headers,
             videoCodecs=fingerprint['videoCodecs'],
             audioCodecs=fingerprint['audioCodecs'],
@@ -362,8 +555,54 @@ class FingerprintGenerator:
         )
 
 
+# Generator used by the current worker process of FingerprintGenerator.generate_many
+_worker_generator: Optional[FingerprintGenerator] = None
+
+
+def _init_worker(generator_class: Type[FingerprintGenerator], options: Dict[str, Any]) -> None:
+    """
+    Prepares a generate_many worker process
+    """
+    global _worker_generator
+    # Forked workers inherit the parent's random state, and would otherwise generate the same fingerprints
+    random.seed()
+    _worker_generator = generator_class(**options)
+
+
+def _generate_in_worker(generate_kwargs: Dict[str, Any]) -> Fingerprint:
+    """
+    Generates a fingerprint in a generate_many worker process
+    """
+    assert _worker_generator is not None  # nosec
+    return _worker_generator.generate(**generate_kwargs)
+
+
+_warned_stdlib_json = False
+
+
+def _warn_stdlib_json() -> None:
+    """
+    Warns once per process that Fingerprint.dumps is using the built-in json module
+    """
+    global _warned_stdlib_json
+    if not _warned_stdlib_json:
+        _warned_stdlib_json = True
+        warnings.warn(
+            'orjson is not installed, so Fingerprint.dumps falls back to the slower built-in '
+            'json module. Install browserforge[all] to speed it up.',
+            stacklevel=3,
+        )
+
+
 def _first(*values):
     """
     Simple function that returns the first non-None value passed
     """
     return next((v for v in values if v is not None), None)
+
+
+def _dataclass_fields(obj: Any) -> Dict[str, Any]:
+    """
+    Returns the fields of a dataclass instance without copying their values
+    """
+    return {field.name: getattr(obj, field.name) for field in fields(obj)}
@@ -1,7 +1,3 @@
-from browserforge.download import DownloadIfNotExists
-
-DownloadIfNotExists(headers=True)
-
 from .generator import Browser, HeaderGenerator
 
 __all__ = [
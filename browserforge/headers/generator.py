@@ -1,8 +1,12 @@
+import threading
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Literal, Optional, Tuple, Union
+from typing import Any, Dict, FrozenSet, Iterable, List, Literal, Optional, Tuple, Union
 
 from browserforge.bayesian_network import BayesianNetwork, get_possible_values
+from browserforge.download import DownloadIfNotExists
 
 from .utils import get_browser, get_user_agent, pascalize_headers, tuplify
 
@@ -36,7 +40,11 @@ HTTP2_SEC_FETCH_ATTRIBUTES = {
     'sec-fetch-user': 'document',
 }
 DATA_DIR: Path = Path(__file__).parent / 'data'
+# Held while the networks are loaded, see HeaderGenerator._load_networks
+_networks_lock = threading.Lock()
 ListOrString: TypeAlias = Union[Tuple[str, ...], List[str], str]
+# Hashable form of a browser: its name, or the fields of a Browser object
+BrowserKey: TypeAlias = Union[str, Tuple[str, Optional[int], Optional[int], Union[str, int]]]
 
 
 @dataclass
@@ -63,10 +71,12 @@ class Browser:
             )
 
 
-@dataclass
+@dataclass(frozen=True)
 class HttpBrowserObject:
     """Represents an HTTP browser object with name, version, complete string, and HTTP version"""
 
+    __slots__ = ('name', 'version', 'complete_string', 'http_version')
+
     name: Optional[str]
     version: Tuple[int, ...]
     complete_string: str
@@ -76,15 +86,25 @@ class HttpBrowserObject:
     def is_http2(self):
         return self.http_version == '2'
 
+    # Pickle restores slots through setattr, which the frozen dataclass forbids
+    def __getstate__(self) -> Tuple[Any, ...]:
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state: Tuple[Any, ...]) -> None:
+        for name, value in zip(self.__slots__, state):
+            object.__setattr__(self, name, value)
+
 
 class HeaderGenerator:
     """Generates HTTP headers based on a set of constraints"""
 
     relaxation_order: Tuple[str, ...] = ('locales', 'devices', 'operatingSystems', 'browsers')
 
-    # Initialize networks
-    input_generator_network = BayesianNetwork(DATA_DIR / "input-network.zip")
-    header_generator_network = BayesianNetwork(DATA_DIR / "header-network.zip")
+    # Loaded by the first generator created, see _load_networks
+    input_generator_network: BayesianNetwork
+    header_generator_network: BayesianNetwork
+    # Internal network attributes (`*BROWSER`, `*HTTP_VERSION`, ...) that never reach the output
+    hidden_attributes: FrozenSet[str]
 
     def __init__(
         self,
@@ -106,6 +126,7 @@ class HeaderGenerator:
             http_version (Literal[1, 2], optional): Http version to be used to generate headers. Defaults to 2.
             strict (bool, optional): Throws an error if it cannot generate headers based on the input. Defaults to False.
         """
+        self._load_networks()
         http_ver: str = str(http_version)
 
         self.options = {
@@ -120,6 +141,36 @@ class HeaderGenerator:
         self.unique_browsers = self._load_unique_browsers()
         self.headers_order = self._load_headers_order()
 
+    @classmethod
+    def _load_networks(cls) -> None:
+        """
+        Downloads the header networks if needed and loads them once for all generators.
+        Deferred until here so importing the package doesn't touch the disk or the network.
+        """
+        if hasattr(cls, 'header_generator_network'):
+            return
+        # Other threads creating generators wait for the first load instead of starting their own
+        with _networks_lock:
+            if hasattr(cls, 'header_generator_network'):
+                return
+            DownloadIfNotExists(headers=True)
+            networks = BayesianNetwork.load_many(
+                {
+                    'input': DATA_DIR / "input-network.zip",
+                    'header': DATA_DIR / "header-network.zip",
+                }
+            )
+            # Set on the base class, so subclasses share the same networks.
+            # header_generator_network marks the load as done, so it is assigned last
+            HeaderGenerator.input_generator_network = networks['input']
+            HeaderGenerator.hidden_attributes = frozenset(
+                node.name
+                for network in networks.values()
+                for node in network.nodes_in_sampling_order
+                if node.name.startswith('*')
+            )
+            HeaderGenerator.header_generator_network = networks['header']
+
     def generate(
         self,
         *,
@@ -146,6 +197,72 @@ class HeaderGenerator:
             strict (Optional[bool], optional): If true, throws an error if it cannot generate headers based on the input.
         """
 
+        options = self._get_generate_options(
+            browser=browser,
+            os=os,
+            device=device,
+            locale=locale,
+            http_version=http_version,
+            user_agent=user_agent,
+            strict=strict,
+            request_dependent_headers=request_dependent_headers,
+        )
+        generated: Dict[str, str] = self._get_headers(**options)
+        if options.get('http_version', self.options['http_version']) == '2':
+            return pascalize_headers(generated)
+        return generated
+
+    def generate_many(self, count: int, **generate_kwargs: Any) -> List[Dict[str, str]]:
+        """
+        Generates multiple sets of headers for the same options.
+        The constraints are prepared once and shared by every sample, rather than per call.
+
+        Parameters:
+            count (int): Number of header sets to generate.
+            **generate_kwargs: Options accepted by HeaderGenerator.generate.
+
+        Returns:
+            List[Dict[str, str]]: Generated headers.
+        """
+        options = self._get_generate_options(**generate_kwargs)
+        pascalize = options.get('http_version', self.options['http_version']) == '2'
+        request_dependent_headers = options.pop('request_dependent_headers', {})
+        user_agents = options.pop('user_agent', None)
+        if user_agents is not None and not isinstance(user_agents, (tuple, list)):
+            user_agents = tuple(user_agents)
+
+        header_options, constraints = self._get_header_constraints(
+            {**options}, *self._get_user_agent_values(user_agents)
+        )
+        generated_headers: List[Dict[str, str]] = []
+        while len(generated_headers) < count:
+            headers = self._sample_headers(header_options, constraints, request_dependent_headers)
+            if headers is None:
+                break
+            generated_headers.append(pascalize_headers(headers) if pascalize else headers)
+        # The search is exhaustive, so once a sample fails every other one would too.
+        # Generate the rest one at a time, going through generate's relaxation logic
+        generated_headers.extend(
+            self.generate(**generate_kwargs) for _ in range(count - len(generated_headers))
+        )
+        return generated_headers
+
+    def _get_generate_options(
+        self,
+        *,
+        browser: Optional[Iterable[Union[str, Browser]]] = None,
+        os: Optional[ListOrString] = None,
+        device: Optional[ListOrString] = None,
+        locale: Optional[ListOrString] = None,
+        http_version: Optional[Literal[1, 2]] = None,
+        user_agent: Optional[ListOrString] = None,
+        strict: Optional[bool] = None,
+        request_dependent_headers: Optional[Dict[str, str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Converts the options passed to generate into the keyword arguments of _get_headers.
+        Options that weren't passed are left out, so the generator's defaults apply.
+        """
         options = {
             'browsers': tuplify(browser),
             'os': tuplify(os),
@@ -156,12 +273,7 @@ class HeaderGenerator:
             'user_agent': tuplify(user_agent),
             'request_dependent_headers': request_dependent_headers,
         }
-        generated: Dict[str, str] = self._get_headers(
-            **{k: v for k, v in options.items() if v is not None}
-        )
-        if (options['http_version'] or self.options['http_version']) == '2':
-            return pascalize_headers(generated)
-        return generated
+        return {k: v for k, v in options.items() if v is not None}
 
     def _get_headers(
         self,
@@ -182,7 +294,72 @@ class HeaderGenerator:
         """
         if request_dependent_headers is None:
             request_dependent_headers = {}
+        # evaluate iterable
+        user_agents: Optional[Union[Tuple[str, ...], List[str]]] = (
+            user_agent
+            if user_agent is None or isinstance(user_agent, (tuple, list))
+            else tuple(user_agent)
+        )
+
+        # The User-Agent closure doesn't change while options are relaxed, so compute it once
+        http1_values, http2_values = self._get_user_agent_values(user_agents)
+        # Set when falling back from HTTP/1 to HTTP/2
+        pascalize = False
+        while True:
+            header_options, constraints = self._get_header_constraints(
+                options, http1_values, http2_values
+            )
+            headers = self._sample_headers(header_options, constraints, request_dependent_headers)
+            if headers is not None:
+                return self.order_headers(pascalize_headers(headers)) if pascalize else headers
+
+            if header_options['http_version'] == '1':
+                options = {**options, 'http_version': '2'}
+                pascalize = True
+                continue
+
+            relaxed_key = next((key for key in self.relaxation_order if key in options), None)
+            if header_options['strict'] or relaxed_key is None:
+                raise ValueError(
+                    'No headers based on this input can be generated. Please relax or change some of the requirements you specified.'
+                )
+
+            options = {key: value for key, value in options.items() if key != relaxed_key}
+
+    def _get_user_agent_values(
+        self, user_agents: Optional[Union[Tuple[str, ...], List[str]]]
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Computes the values induced by the User-Agent(s) in the HTTP/1 and HTTP/2 header networks.
+
+        Parameters:
+            user_agents (Union[Tuple[str, ...], List[str]], optional): User-Agent value(s).
+
+        Returns:
+            Tuple[Dict[str, Any], Dict[str, Any]]: HTTP/1 and HTTP/2 values, empty without User-Agents.
+        """
+        if not user_agents:
+            return {}, {}
+        return (
+            get_possible_values(self.header_generator_network, {'User-Agent': user_agents}),
+            get_possible_values(self.header_generator_network, {'user-agent': user_agents}),
+        )
+
+    def _get_header_constraints(
+        self, options: Dict[str, Any], http1_values: Dict[str, Any], http2_values: Dict[str, Any]
+    ) -> Tuple[Dict[str, Any], Dict[str, Iterable[str]]]:
+        """
+        Prepares the header options and the input network constraints for the given options.
+        The browsers in `options` are updated in place when a new http_version is passed.
+
+        Parameters:
+            options (Dict[str, Any]): Options for header generation.
+            http1_values (Dict[str, Any]): Dictionary of HTTP/1 values.
+            http2_values (Dict[str, Any]): Dictionary of HTTP/2 values.
 
+        Returns:
+            Tuple[Dict[str, Any], Dict[str, Iterable[str]]]: Header options and constraints.
+        """
         # Process new options
         if 'browsers' in options or (
             # if a unique http_version was passed
@@ -193,43 +370,33 @@ class HeaderGenerator:
 
         header_options = {**self.options, **options}
         possible_attribute_values = self._get_possible_attribute_values(header_options)
-
-        if user_agent:
-            # evaluate iterable
-            if not isinstance(user_agent, (tuple, list)):
-                user_agent = tuple(user_agent)
-            http1_values, http2_values = (
-                get_possible_values(self.header_generator_network, {'User-Agent': user_agent}),
-                get_possible_values(self.header_generator_network, {'user-agent': user_agent}),
-            )
-        else:
-            http1_values, http2_values = {}, {}
-
         constraints = self._prepare_constraints(
             possible_attribute_values, http1_values, http2_values
         )
+        return header_options, constraints
+
+    def _sample_headers(
+        self,
+        header_options: Dict[str, Any],
+        constraints: Dict[str, Iterable[str]],
+        request_dependent_headers: Dict[str, str],
+    ) -> Optional[Dict[str, str]]:
+        """
+        Samples a set of headers consistent with the prepared constraints.
+
+        Parameters:
+            header_options (Dict[str, Any]): Header options.
+            constraints (Dict[str, Iterable[str]]): Input network constraints.
+            request_dependent_headers (Dict[str, str]): Dictionary of request-dependent headers.
 
+        Returns:
+            Optional[Dict[str, str]]: Ordered headers, or None if the constraints can't be satisfied.
+        """
         input_sample = self.input_generator_network.generate_consistent_sample_when_possible(
             constraints
         )
         if not input_sample:
-            if header_options['http_version'] == '1':
-                headers2 = self._get_headers(
-                    request_dependent_headers, user_agent, **options, http_version='2'
-                )
-                return self.order_headers(pascalize_headers(headers2))
-
-            relaxation_index = next(
-                (i for i, key in enumerate(self.relaxation_order) if key in options), -1
-            )
-            if header_options['strict'] or relaxation_index == -1:
-                raise ValueError(
-                    'No headers based on this input can be generated. Please relax or change some of the requirements you specified.'
-                )
-
-            relaxed_options = {**options}
-            del relaxed_options[self.relaxation_order[relaxation_index]]
-            return self._get_headers(request_dependent_headers, user_agent, **relaxed_options)
+            return None
 
         generated_sample = self.header_generator_network.generate_sample(input_sample)
         generated_http_and_browser = self._prepare_http_browser_object(
@@ -252,15 +419,13 @@ class HeaderGenerator:
                 generated_sample.update(HTTP1_SEC_FETCH_ATTRIBUTES)
 
         # Ommit connection, close, and missing value headers
+        for key in self.hidden_attributes:
+            generated_sample.pop(key, None)
+        for key in ('Connection', 'connection'):
+            if generated_sample.get(key) == 'close':
+                del generated_sample[key]
         generated_sample = {
-            k: v
-            for k, v in generated_sample.items()
-            if not (
-                k.lower() == 'connection'
-                and v == 'close'
-                or k.startswith('*')
-                or v == MISSING_VALUE_DATASET_TOKEN
-            )
+            k: v for k, v in generated_sample.items() if v != MISSING_VALUE_DATASET_TOKEN
         }
 
         # Reorder headers
@@ -285,23 +450,14 @@ class HeaderGenerator:
             options['browsers'] = self._prepare_browsers_config(options['browsers'], http_version)
         else:
             # Create a copy of the class browsers with an updated http_version
-            options['browsers'] = [
-                (
-                    Browser(
-                        name=brwsr.name,
-                        min_version=brwsr.min_version,
-                        max_version=brwsr.max_version,
-                        http_version=http_version,
-                    )
-                    if isinstance(brwsr, Browser)
-                    else Browser(name=brwsr, http_version=http_version)
-                )
-                for brwsr in self.options['browsers']
-            ]
+            options['browsers'] = self._override_http_version(
+                self.options['browsers'], http_version
+            )
 
+    @staticmethod
     def _prepare_browsers_config(
-        self, browsers: Iterable[Union[str, Browser]], http_version: str
-    ) -> List[Browser]:
+        browsers: Iterable[Union[str, Browser]], http_version: str
+    ) -> Tuple[Browser, ...]:
         """
         Prepares the browser configuration based on the given browsers and HTTP version.
 
@@ -310,16 +466,25 @@ class HeaderGenerator:
             http_version (str): HTTP version ('1' or '2').
 
         Returns:
-            List[Browser]: List of Browser objects.
+            Tuple[Browser, ...]: Tuple of Browser objects.
         """
-        return [
-            (
-                Browser(name=browser, http_version=http_version)
-                if isinstance(browser, str)
-                else browser
-            )
-            for browser in browsers
-        ]
+        return _prepare_browsers(_get_browser_keys(browsers), http_version)
+
+    @staticmethod
+    def _override_http_version(
+        browsers: Iterable[Union[str, Browser]], http_version: str
+    ) -> Tuple[Browser, ...]:
+        """
+        Copies the given browsers with their HTTP version replaced.
+
+        Parameters:
+            browsers (Iterable[Union[str, Browser]]): Supported browsers or Browser objects.
+            http_version (str): HTTP version ('1' or '2').
+
+        Returns:
+            Tuple[Browser, ...]: Tuple of Browser objects.
+        """
+        return _override_browsers_http_version(_get_browser_keys(browsers), http_version)
 
     def _get_browser_http_options(self, browsers: Iterable[Browser]) -> List[str]:
         """
@@ -331,15 +496,25 @@ class HeaderGenerator:
         Returns:
             List[str]: List of browser HTTP options.
         """
-        return [
-            browser_option.complete_string
-            for browser in browsers
-            for browser_option in self.unique_browsers
-            if browser.name == browser_option.name
-            and (not browser.min_version or browser.min_version <= browser_option.version[0])
-            and (not browser.max_version or browser.max_version >= browser_option.version[0])
-            and (not browser.http_version or browser.http_version == browser_option.http_version)
-        ]
+        browsers_index = self._index_unique_browsers()
+        browser_http_options: List[str] = []
+        for browser in browsers:
+            http_versions = (
+                (browser.http_version,) if browser.http_version else SUPPORTED_HTTP_VERSIONS
+            )
+            for http_version in http_versions:
+                versions, complete_strings = browsers_index.get(
+                    (browser.name, str(http_version)), ((), ())
+                )
+                # Slice the matching major versions out of the sorted group
+                start = bisect_left(versions, browser.min_version) if browser.min_version else 0
+                end = (
+                    bisect_right(versions, browser.max_version)
+                    if browser.max_version
+                    else len(versions)
+                )
+                browser_http_options.extend(complete_strings[start:end])
+        return browser_http_options
 
     def order_headers(self, headers: Dict[str, str]) -> Dict[str, str]:
         """
@@ -422,34 +597,67 @@ class HeaderGenerator:
         Returns:
             str: Accept-Language header string.
         """
-        return ', '.join(
-            f"{locale};q={1.0 - index * 0.1:.1f}" for index, locale in enumerate(locales)
-        )
+        # The same locales are passed on every call, so the header is only formatted once
+        return _format_accept_language_header(tuple(locales))
 
-    def _load_headers_order(self) -> Dict[str, List[str]]:
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _load_headers_order() -> Dict[str, Tuple[str, ...]]:
         """
         Loads the headers order from the headers-order.json file.
+        Cached, so only the first generator reads the file.
 
         Returns:
-            Dict[str, List[str]]: Dictionary of headers order for each browser.
+            Dict[str, Tuple[str, ...]]: Dictionary of headers order for each browser.
         """
         headers_order_path = DATA_DIR / "headers-order.json"
-        return json.loads(headers_order_path.read_bytes())
+        # Stored as tuples, since the cached orders are shared by every generator
+        return {
+            browser: tuple(order)
+            for browser, order in json.loads(headers_order_path.read_bytes()).items()
+        }
 
-    def _load_unique_browsers(self) -> List[HttpBrowserObject]:
+    @classmethod
+    @lru_cache(maxsize=None)
+    def _load_unique_browsers(cls) -> Tuple[HttpBrowserObject, ...]:
         """
         Loads the unique browsers from the browser-helper-file.json file.
+        Cached, so only the first generator reads and parses the file.
 
         Returns:
-            List[HttpBrowserObject]: List of HttpBrowserObject instances.
+            Tuple[HttpBrowserObject, ...]: HttpBrowserObject instances.
         """
         browser_helper_path = DATA_DIR / 'browser-helper-file.json'
         unique_browser_strings = json.loads(browser_helper_path.read_bytes())
-        return [
-            self._prepare_http_browser_object(browser_str)
+        return tuple(
+            cls._prepare_http_browser_object(browser_str)
             for browser_str in unique_browser_strings
             if browser_str != MISSING_VALUE_DATASET_TOKEN
-        ]
+        )
+
+    @classmethod
+    @lru_cache(maxsize=None)
+    def _index_unique_browsers(
+        cls,
+    ) -> Dict[Tuple[Optional[str], str], Tuple[Tuple[int, ...], Tuple[str, ...]]]:
+        """
+        Groups the unique browsers by name and HTTP version, sorted by major version.
+
+        Returns:
+            Dict[Tuple[Optional[str], str], Tuple[Tuple[int, ...], Tuple[str, ...]]]: Major versions
+                and complete strings of the browsers for each name and HTTP version.
+        """
+        groups: Dict[Tuple[Optional[str], str], List[HttpBrowserObject]] = {}
+        for browser in cls._load_unique_browsers():
+            groups.setdefault((browser.name, browser.http_version), []).append(browser)
+        browsers_index = {}
+        for key, group in groups.items():
+            group.sort(key=lambda browser: browser.version[0])
+            browsers_index[key] = (
+                tuple(browser.version[0] for browser in group),
+                tuple(browser.complete_string for browser in group),
+            )
+        return browsers_index
 
     def _prepare_constraints(
         self,
@@ -468,19 +676,30 @@ class HeaderGenerator:
         Returns:
             Dict[str, Iterable[str]]: Dictionary of constraints for each attribute.
         """
-        return {
-            key: tuple(
-                filter(
-                    lambda x: (
-                        self.filter_browser_http(x, http1_values, http2_values)
-                        if key == '*BROWSER_HTTP'
-                        else self.filter_other_values(x, http1_values, http2_values, key)
-                    ),
-                    values,
-                )
-            )
-            for key, values in possible_attribute_values.items()
+        # Without User-Agent constraints every value is allowed
+        if not (http1_values or http2_values):
+            return {key: tuple(values) for key, values in possible_attribute_values.items()}
+
+        # Browsers allowed by each HTTP version's values, where None allows any.
+        # Same rules as filter_browser_http and filter_other_values, with the lookups done in sets
+        allowed_browsers = {
+            '1': frozenset(http1_values.get('*BROWSER', ())) if http1_values else None,
+            '2': frozenset(http2_values.get('*BROWSER', ())) if http2_values else None,
         }
+        constraints: Dict[str, Iterable[str]] = {}
+        for key, values in possible_attribute_values.items():
+            if key == '*BROWSER_HTTP':
+                kept = []
+                for value in values:
+                    browser_name, _, http_version = value.partition('|')
+                    allowed = allowed_browsers['1' if http_version == '1' else '2']
+                    if allowed is None or browser_name in allowed:
+                        kept.append(value)
+                constraints[key] = tuple(kept)
+            else:
+                allowed_values = {*http1_values.get(key, ()), *http2_values.get(key, ())}
+                constraints[key] = tuple(value for value in values if value in allowed_values)
+        return constraints
 
     @staticmethod
     def filter_browser_http(
@@ -524,7 +743,9 @@ class HeaderGenerator:
             return value in http1_values.get(key, ()) or value in http2_values.get(key, ())
         return True
 
-    def _prepare_http_browser_object(self, http_browser_string: str) -> HttpBrowserObject:
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _prepare_http_browser_object(http_browser_string: str) -> HttpBrowserObject:
         """
         Extracts structured information about a browser and HTTP version from a string.
 
@@ -534,18 +755,70 @@ class HeaderGenerator:
         Returns:
             HttpBrowserObject: HttpBrowserObject instance.
         """
-        browser_string, http_version = http_browser_string.split('|')
+        browser_string, _, http_version = http_browser_string.partition('|')
         if browser_string == MISSING_VALUE_DATASET_TOKEN:
             return HttpBrowserObject(
                 name=None, version=(), complete_string=MISSING_VALUE_DATASET_TOKEN, http_version=''
             )
 
-        browser_name, version_string = browser_string.split('/')
-        version_parts = version_string.split('.')
-        version = tuple(int(part) for part in version_parts)
+        browser_name, _, version_string = browser_string.partition('/')
         return HttpBrowserObject(
             name=browser_name,
-            version=version,
+            version=tuple(map(int, version_string.split('.'))),
             complete_string=http_browser_string,
             http_version=http_version,
         )
+
+
+@lru_cache(maxsize=64)
+def _format_accept_language_header(locales: Tuple[str, ...]) -> str:
+    """
+    Formats the Accept-Language header, with q-values decreasing by 0.1 per locale
+    """
+    return ', '.join(f"{locale};q={1.0 - index * 0.1:.1f}" for index, locale in enumerate(locales))
+
+
+def _get_browser_keys(browsers: Iterable[Union[str, Browser]]) -> Tuple[BrowserKey, ...]:
+    """
+    Converts browsers to their hashable field values, since Browser objects are mutable
+    """
+    return tuple(
+        (
+            browser
+            if isinstance(browser, str)
+            else (browser.name, browser.min_version, browser.max_version, browser.http_version)
+        )
+        for browser in browsers
+    )
+
+
+@lru_cache(maxsize=64)
+def _prepare_browsers(browsers: Tuple[BrowserKey, ...], http_version: str) -> Tuple[Browser, ...]:
+    """
+    Builds the Browser objects of a browser configuration, using http_version for browser names
+    """
+    return tuple(
+        (
+            Browser(name=browser, http_version=http_version)
+            if isinstance(browser, str)
+            else Browser(*browser)
+        )
+        for browser in browsers
+    )
+
+
+@lru_cache(maxsize=64)
+def _override_browsers_http_version(
+    browsers: Tuple[BrowserKey, ...], http_version: str
+) -> Tuple[Browser, ...]:
+    """
+    Builds the Browser objects of a browser configuration, all with the given http_version
+    """
+    return tuple(
+        (
+            Browser(name=browser, http_version=http_version)
+            if isinstance(browser, str)
+            else Browser(*browser[:3], http_version=http_version)
+        )
+        for browser in browsers
+    )
@@ -1,3 +1,4 @@
+from functools import lru_cache
 from typing import Any, Dict, Iterable, Optional
 
 
@@ -8,6 +9,8 @@ def get_user_agent(headers: Dict[str, str]) -> Optional[str]:
     return headers.get('User-Agent') or headers.get('user-agent')
 
 
+# The generated User-Agents repeat often, so the alias checks are cached per string
+@lru_cache(maxsize=1024)
 def get_browser(user_agent: str) -> Optional[str]:
     """
     Determines the browser name from the User-Agent string.
@@ -26,6 +29,8 @@ def get_browser(user_agent: str) -> Optional[str]:
 PASCALIZE_UPPER = {'dnt', 'rtt', 'ect'}
 
 
+# Header names come from a small vocabulary, so each one is only converted once
+@lru_cache(maxsize=256)
 def pascalize(name: str) -> str:
     # ignore
     if name.startswith(':') or name.startswith('sec-ch-ua'):
@@ -41,6 +46,9 @@ def pascalize_headers(headers: Dict[str, str]) -> Dict[str, str]:
 
 
 def tuplify(obj: Any):
-    if (isinstance(obj, Iterable) and not isinstance(obj, str)) or obj is None:
+    # Check the common concrete types first, the Iterable ABC check is much slower
+    if obj is None or isinstance(obj, (tuple, list, set, frozenset)):
         return obj
-    return (obj,)
+    if isinstance(obj, str) or not isinstance(obj, Iterable):
+        return (obj,)
+    return obj
@@ -1,3 +1,4 @@
+import asyncio
 import re
 from typing import Dict, Optional
 
@@ -7,6 +8,11 @@ from pyppeteer.page import Page
 from browserforge.fingerprints import Fingerprint
 from browserforge.injectors.utils import InjectFunction, _fingerprint, only_injectable_headers
 
+# Major version in browser.version() (`HeadlessChrome/120.0.6099.109`)
+VERSION_REGEX = re.compile(r'/(\d+)')
+MOBILE_TOKENS = ('phone', 'android', 'mobile')
+DARK_MODE_MEDIA = {'features': [{'name': 'prefers-color-scheme', 'value': 'dark'}]}
+
 
 async def NewPage(
     browser: Browser,
@@ -26,38 +32,38 @@ async def NewPage(
     # create a new page
     page = await browser.newPage()
 
-    await page.setUserAgent(fingerprint.navigator.userAgent)
-
     # Pyppeteer does not support firefox, so we can ignore checks
+    user_agent = fingerprint.navigator.userAgent.lower()
     cdp_sess = await page.target.createCDPSession()
-    await cdp_sess.send(
-        'Page.setDeviceMetricsOverride',
-        {
-            'screenHeight': fingerprint.screen.height,
-            'screenWidth': fingerprint.screen.width,
-            'width': fingerprint.screen.width,
-            'height': fingerprint.screen.height,
-            'mobile': any(
-                name in fingerprint.navigator.userAgent for name in ('phone', 'android', 'mobile')
-            ),
-            'screenOrientation': (
-                {'angle': 0, 'type': 'portraitPrimary'}
-                if fingerprint.screen.height > fingerprint.screen.width
-                else {'angle': 90, 'type': 'landscapePrimary'}
-            ),
-            'deviceScaleFactor': fingerprint.screen.devicePixelRatio,
-        },
+    # None of these calls depend on each other, so send them all at once
+    # instead of waiting for a round trip each
+    *_, browser_version = await asyncio.gather(
+        page.setUserAgent(fingerprint.navigator.userAgent),
+        cdp_sess.send(
+            'Page.setDeviceMetricsOverride',
+            {
+                'screenHeight': fingerprint.screen.height,
+                'screenWidth': fingerprint.screen.width,
+                'width': fingerprint.screen.width,
+                'height': fingerprint.screen.height,
+                'mobile': any(name in user_agent for name in MOBILE_TOKENS),
+                'screenOrientation': (
+                    {'angle': 0, 'type': 'portraitPrimary'}
+                    if fingerprint.screen.height > fingerprint.screen.width
+                    else {'angle': 90, 'type': 'landscapePrimary'}
+                ),
+                'deviceScaleFactor': fingerprint.screen.devicePixelRatio,
+            },
+        ),
+        page.setExtraHTTPHeaders(only_injectable_headers(fingerprint.headers, 'chrome')),
+        browser.version(),
     )
-    await page.setExtraHTTPHeaders(only_injectable_headers(fingerprint.headers, 'chrome'))
 
+    # Inject function
+    tasks = [page.evaluateOnNewDocument(function)]
     # Only set to dark mode if the Chrome version >= 76
-    version = re.search('.*?/(\d+)[\d\.]+?', await browser.version())
+    version = VERSION_REGEX.search(browser_version)
     if version and int(version[1]) >= 76:
-        await page._client.send(
-            'Emulation.setEmulatedMedia',
-            {'features': [{'name': 'prefers-color-scheme', 'value': 'dark'}]},
-        )
-
-    # Inject function
-    await page.evaluateOnNewDocument(function)
+        tasks.append(page._client.send('Emulation.setEmulatedMedia', DARK_MODE_MEDIA))
+    await asyncio.gather(*tasks)
     return page
@@ -1,23 +1,28 @@
+import importlib.util
 import lzma
+from functools import lru_cache
 from pathlib import Path
 from random import randrange
-from typing import Dict, Optional, Set
+from typing import Dict, FrozenSet, Optional
 
 from browserforge.fingerprints import Fingerprint, FingerprintGenerator
 
 UTILS_JS: Path = Path(__file__).parent / 'data/utils.js.xz'
 
-request_headers: Set[str] = {
-    'accept-encoding',
-    'accept',
-    'cache-control',
-    'pragma',
-    'sec-fetch-dest',
-    'sec-fetch-mode',
-    'sec-fetch-site',
-    'sec-fetch-user',
-    'upgrade-insecure-requests',
-}
+request_headers: FrozenSet[str] = frozenset(
+    {
+        'accept-encoding',
+        'accept',
+        'cache-control',
+        'pragma',
+        'sec-fetch-dest',
+        'sec-fetch-mode',
+        'sec-fetch-site',
+        'sec-fetch-user',
+        'upgrade-insecure-requests',
+    }
+)
+chromium_request_headers: FrozenSet[str] = request_headers | {'te'}
 
 
 def only_injectable_headers(headers: Dict[str, str], browser_name: str) -> Dict[str, str]:
@@ -25,17 +30,13 @@ def only_injectable_headers(headers: Dict[str, str], browser_name: str) -> Dict[
     Some HTTP headers depend on the request (for example Accept (with values application/json, image/png) etc.).
     This function filters out those headers and leaves only the browser-wide ones.
     """
-    filtered_headers = {k: v for k, v in headers.items() if k.lower() not in request_headers}
-
     # Chromium-based controlled browsers do not support `te` header.
     # Remove the `te` header if the browser is not Firefox
     if browser_name and 'firefox' not in browser_name.lower():
-        if 'te' in filtered_headers:
-            del filtered_headers['te']
-        if 'Te' in filtered_headers:
-            del filtered_headers['Te']
-
-    return filtered_headers
+        excluded_headers = chromium_request_headers
+    else:
+        excluded_headers = request_headers
+    return {k: v for k, v in headers.items() if k.lower() not in excluded_headers}
 
 
 def InjectFunction(fingerprint: Fingerprint) -> str:
@@ -118,6 +119,7 @@ def InjectFunction(fingerprint: Fingerprint) -> str:
     """
 
 
+@lru_cache(maxsize=None)
 def utils_js() -> str:
     """
     Opens and uncompresses the utils.js file and returns it as a string
@@ -142,6 +144,4 @@ def CheckIfInstalled(module_name: str):
     """
     Checks if a module is installed
     """
-    import importlib.util
-
     return importlib.util.find_spec(module_name) is not None
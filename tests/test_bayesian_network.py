@@ -0,0 +1,254 @@
+import json
+import random
+from collections import Counter
+
+import pytest
+
+from browserforge import bayesian_network
+from browserforge.bayesian_network import (
+    BayesianNetwork,
+    build_alias_table,
+    filter_by_last_level_keys,
+    get_possible_values,
+    sample_from_alias_table,
+    undeeper,
+)
+from browserforge.headers import HeaderGenerator
+
+# A -> B -> C, with a "skip" branch on B and C
+NETWORK_DEFINITION = {
+    'nodes': [
+        {
+            'name': 'A',
+            'parentNames': [],
+            'possibleValues': ['a1', 'a2'],
+            'conditionalProbabilities': {'a1': 0.7, 'a2': 0.3},
+        },
+        {
+            'name': 'B',
+            'parentNames': ['A'],
+            'possibleValues': ['b1', 'b2', 'b3'],
+            'conditionalProbabilities': {
+                'deeper': {'a1': {'b1': 0.5, 'b2': 0.5}, 'a2': {'b3': 1.0}},
+                'skip': {'b1': 1.0},
+            },
+        },
+        {
+            'name': 'C',
+            'parentNames': ['B'],
+            'possibleValues': ['c1', 'c2', 'c3'],
+            'conditionalProbabilities': {
+                'deeper': {'b1': {'c1': 1.0}, 'b2': {'c2': 0.25, 'c3': 0.75}},
+                'skip': {'c3': 1.0},
+            },
+        },
+    ]
+}
+
+
+@pytest.fixture
+def network(tmp_path):
+    path = tmp_path / 'network.json'
+    path.write_text(json.dumps(NETWORK_DEFINITION))
+    return BayesianNetwork(path)
+
+
+def alias_distribution(alias_table):
+    """Exact distribution an alias table samples from"""
+    values, cutoffs, aliases = alias_table
+    distribution = dict.fromkeys(values, 0.0)
+    for index, cutoff in enumerate(cutoffs):
+        distribution[values[index]] += cutoff / len(values)
+        distribution[values[aliases[index]]] += (1 - cutoff) / len(values)
+    return distribution
+
+
+def test_alias_table_matches_probabilities():
+    probabilities = {'w': 0.1, 'x': 0.45, 'y': 0.05, 'z': 0.4}
+    distribution = alias_distribution(build_alias_table(probabilities))
+    assert distribution == pytest.approx(probabilities)
+
+
+def test_alias_table_normalizes_probabilities():
+    distribution = alias_distribution(build_alias_table({'x': 2, 'y': 6}))
+    assert distribution == pytest.approx({'x': 0.25, 'y': 0.75})
+
+
+def test_alias_table_defaults_to_first_value_without_weights():
+    alias_table = build_alias_table({'x': 0, 'y': 0})
+    assert alias_distribution(alias_table) == {'x': 1.0, 'y': 0.0}
+    assert sample_from_alias_table(alias_table) == 'x'
+
+
+def test_alias_sampling_frequencies():
+    random.seed(0)
+    alias_table = build_alias_table({'x': 0.2, 'y': 0.5, 'z': 0.3})
+    counts = Counter(sample_from_alias_table(alias_table) for _ in range(20000))
+    assert counts['x'] / 20000 == pytest.approx(0.2, abs=0.02)
+    assert counts['y'] / 20000 == pytest.approx(0.5, abs=0.02)
+    assert counts['z'] / 20000 == pytest.approx(0.3, abs=0.02)
+
+
+def test_generate_sample_marginals(network):
+    random.seed(0)
+    samples = [network.generate_sample() for _ in range(20000)]
+    counts = Counter((sample['A'], sample['B'], sample['C']) for sample in samples)
+    assert set(counts) == {
+        ('a1', 'b1', 'c1'),
+        ('a1', 'b2', 'c2'),
+        ('a1', 'b2', 'c3'),
+        ('a2', 'b3', 'c3'),
+    }
+    assert counts['a1', 'b1', 'c1'] / 20000 == pytest.approx(0.35, abs=0.02)
+    assert counts['a1', 'b2', 'c3'] / 20000 == pytest.approx(0.2625, abs=0.02)
+    assert counts['a2', 'b3', 'c3'] / 20000 == pytest.approx(0.3, abs=0.02)
+
+
+def test_generate_sample_keeps_input_values(network):
+    for _ in range(100):
+        assert network.generate_sample({'A': 'a2'}) == {'A': 'a2', 'B': 'b3', 'C': 'c3'}
+        # Unknown parent values sample from the "skip" branch
+        assert network.generate_sample({'A': 'other'}) == {'A': 'other', 'B': 'b1', 'C': 'c1'}
+
+
+@pytest.mark.parametrize(
+    'anchor, banned_values, expected',
+    [(0.2, [], 'c2'), (0.3, [], 'c3'), (0.9, ['c3'], 'c2'), (0.0, ['c2'], 'c3')],
+)
+def test_restricted_sampling_bisects_allowed_values(
+    network, monkeypatch, anchor, banned_values, expected
+):
+    monkeypatch.setattr(bayesian_network, 'random', lambda: anchor)
+    node = network.nodes_by_name['C']
+    # c1 is allowed, but has no probability given B=b2
+    value = node.sample_according_to_restrictions({'B': 'b2'}, ['c1', 'c2', 'c3'], banned_values)
+    assert value == expected
+
+
+def test_restricted_sampling_without_allowed_values(network):
+    node = network.nodes_by_name['C']
+    assert node.sample_according_to_restrictions({'B': 'b2'}, ['c2', 'c3'], ['c2', 'c3']) is None
+    assert node.sample_according_to_restrictions({'B': 'b2'}, ['c1'], []) is None
+
+
+def test_restricted_sampling_never_returns_banned_values(network):
+    random.seed(0)
+    node = network.nodes_by_name['B']
+    values = {
+        node.sample_according_to_restrictions({'A': 'a1'}, node.possible_values, ['b1'])
+        for _ in range(1000)
+    }
+    assert values == {'b2'}
+
+
+def test_consistent_sample_is_none_when_unsatisfiable(network):
+    # A=a2 always leads to B=b3 and C=c3
+    assert network.generate_consistent_sample_when_possible({'A': ['a2'], 'C': ['c1']}) is None
+    assert network.generate_consistent_sample_when_possible({'B': ['b4']}) is None
+
+
+@pytest.mark.parametrize(
+    'value_possibilities, expected',
+    [
+        # B=b2 is sampled first and leads to a dead end on C
+        ({'C': ['c1']}, {'A': 'a1', 'B': 'b1', 'C': 'c1'}),
+        # A=a1 is sampled first and leads to a dead end on B
+        ({'B': ['b3'], 'C': ['c3']}, {'A': 'a2', 'B': 'b3', 'C': 'c3'}),
+    ],
+)
+def test_consistent_sample_backtracks(network, monkeypatch, value_possibilities, expected):
+    monkeypatch.setattr(bayesian_network, 'random', lambda: 0.99)
+    assert network.generate_consistent_sample_when_possible(value_possibilities) == expected
+
+
+def test_consistent_samples_respect_restrictions(network):
+    random.seed(0)
+    for _ in range(1000):
+        sample = network.generate_consistent_sample_when_possible({'C': ['c3']})
+        assert sample in ({'A': 'a1', 'B': 'b2', 'C': 'c3'}, {'A': 'a2', 'B': 'b3', 'C': 'c3'})
+
+
+def test_alias_tables_are_indexed_by_deeper_parent_values(network):
+    nodes = network.nodes_by_name
+    assert set(nodes['A'].alias_tables_by_parent_values) == {()}
+    assert set(nodes['B'].alias_tables_by_parent_values) == {('a1',), ('a2',)}
+    assert set(nodes['C'].alias_tables_by_parent_values) == {('b1',), ('b2',)}
+
+
+@pytest.mark.parametrize('parent_values', [{'B': 'b1'}, {'B': 'b2'}, {'B': 'b3'}, {}])
+def test_alias_table_lookup_matches_probabilities(network, parent_values):
+    node = network.nodes_by_name['C']
+    alias_table = node.get_alias_table_given_known_values(parent_values)
+    probabilities = node.get_probabilities_given_known_values(parent_values)
+    assert alias_distribution(alias_table) == pytest.approx(probabilities)
+
+
+def test_alias_table_lookup_matches_probabilities_on_real_network():
+    HeaderGenerator()
+    for node in HeaderGenerator.input_generator_network.nodes_in_sampling_order:
+        for parent_values, alias_table in node.alias_tables_by_parent_values.items():
+            probabilities = node.get_probabilities_given_known_values(
+                dict(zip(node.parent_names, parent_values))
+            )
+            total = sum(probabilities.values())
+            expected = {value: p / total for value, p in probabilities.items()}
+            assert alias_distribution(alias_table) == pytest.approx(expected)
+
+
+def test_undeeper_removes_deeper_and_skip(network):
+    probabilities = network.nodes_by_name['B'].node_definition['conditionalProbabilities']
+    assert undeeper(probabilities) == {'a1': {'b1': 0.5, 'b2': 0.5}, 'a2': {'b3': 1.0}}
+
+
+def test_undeeper_nested_levels():
+    probabilities = {
+        'deeper': {
+            'x1': {
+                'deeper': {'y1': {'v1': 1.0}, 'y2': {'v1': 0.5, 'v2': 0.5}},
+                'skip': {'v2': 1.0},
+            },
+            'x2': {'skip': {'v3': 1.0}},
+        },
+        'skip': {'skip': {'v3': 1.0}},
+    }
+    assert undeeper(probabilities) == {
+        'x1': {'y1': {'v1': 1.0}, 'y2': {'v1': 0.5, 'v2': 0.5}},
+        'x2': {},
+    }
+
+
+def test_undeeper_leaves():
+    leaf = {'v1': 0.5, 'v2': 0.5}
+    assert undeeper(leaf) is leaf
+    assert undeeper(0.5) == 0.5
+
+
+def test_filter_by_last_level_keys_docstring_tree():
+    tree = {'1': {'2': {'4': 0.5, '5': 0.5}, '3': {'6': 0.5, '7': 0.5}}}
+    assert filter_by_last_level_keys(tree, ['4', '7']) == [('1',), ('2', '3')]
+    assert filter_by_last_level_keys(tree, ['5']) == [('1',), ('2',)]
+    assert filter_by_last_level_keys(tree, ['8']) == []
+
+
+def test_filter_by_last_level_keys_drops_levels_past_shortest_path():
+    tree = {'a': {'b': {'k': 1.0}}, 'c': {'k': 1.0}}
+    assert filter_by_last_level_keys(tree, ('k',)) == [('a', 'c')]
+
+
+def test_filter_by_last_level_keys_of_definition(network):
+    probabilities = network.nodes_by_name['C'].node_definition['conditionalProbabilities']
+    tree = undeeper(probabilities)
+    assert filter_by_last_level_keys(tree, ['c3']) == [('b2',)]
+    assert filter_by_last_level_keys(tree, ['c1', 'c2']) == [('b1', 'b2')]
+
+
+def test_possible_values_of_definition(network):
+    assert get_possible_values(network, {'C': ['c1', 'c2']}) == {
+        'B': ('b1', 'b2'),
+        'C': ['c1', 'c2'],
+    }
+    assert get_possible_values(network, {'B': ['b2', 'b3'], 'C': ['c1', 'c2']}) == {
+        'A': ('a1', 'a2'),
+        'B': ['b2'],
+        'C': ['c1', 'c2'],
+    }
@@ -0,0 +1,104 @@
+import http.server
+import re
+import threading
+
+import pytest
+
+from browserforge import download
+from browserforge.download import DataDownloader
+
+
+class RangeServer(http.server.ThreadingHTTPServer):
+    """Serves `content` with byte range and If-Range support"""
+
+    content: bytes = b''
+    etag: str = '"v1"'
+    # Reports the total size of ranges as unknown (`bytes 0-9/*`)
+    unknown_total: bool = False
+    # Replaced with `next_content` after the first request
+    next_content: bytes = b''
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), RangeHandler)
+        self.requests = []
+
+    @property
+    def url(self):
+        return f'http://127.0.0.1:{self.server_address[1]}/file'
+
+    def respond(self, range_header, if_range):
+        content, etag = self.content, self.etag
+        if self.next_content:
+            self.content, self.etag, self.next_content = self.next_content, '"v2"', b''
+        match = re.match(r'bytes=(\d+)-(\d+)', range_header or '')
+        if not match or (if_range and if_range != etag):
+            return 200, {'ETag': etag}, content
+        if int(match[1]) >= len(content):
+            return 416, {'Content-Range': f'bytes */{len(content)}'}, b''
+        start, end = int(match[1]), min(int(match[2]), len(content) - 1)
+        total = '*' if self.unknown_total else len(content)
+        headers = {'ETag': etag, 'Content-Range': f'bytes {start}-{end}/{total}'}
+        return 206, headers, content[start : end + 1]
+
+
+class RangeHandler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.server.requests.append(self.headers.get('Range'))
+        status, headers, body = self.server.respond(
+            self.headers.get('Range'), self.headers.get('If-Range')
+        )
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server(monkeypatch):
+    monkeypatch.setattr(download, 'DOWNLOAD_PART_SIZE', 10)
+    server = RangeServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_download_in_ranges(server):
+    server.content = bytes(range(95))
+    assert DataDownloader()._download(server.url) == server.content
+    assert len(server.requests) == 10
+
+
+def test_download_unknown_total_size(server):
+    server.content = bytes(range(95))
+    server.unknown_total = True
+    assert DataDownloader()._download(server.url) == server.content
+    assert server.requests[-1] is None
+
+
+def test_download_file_changed_midway(server):
+    server.content = bytes(range(95))
+    server.next_content = updated = bytes(range(100, 195))
+    assert DataDownloader()._download(server.url) == updated
+    # The new file sent in place of a range is used rather than downloaded again
+    assert None not in server.requests
+
+
+def test_download_empty_file(server):
+    server.content = b''
+    assert DataDownloader()._download(server.url) == b''
+    assert server.requests == ['bytes=0-9', None]
+
+
+def test_remove_deletes_existing_files(tmp_path, monkeypatch):
+    existing, missing = tmp_path / 'a.json', tmp_path / 'b.zip'
+    existing.write_bytes(b'{}')
+    monkeypatch.setattr(download, 'ALL_PATHS', (existing, missing))
+    download.Remove()
+    assert not existing.exists()
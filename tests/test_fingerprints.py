@@ -0,0 +1,86 @@
+import subprocess
+import sys
+
+from browserforge.fingerprints import FingerprintGenerator, Screen
+
+GENERATE_MANY_SPAWN = '''
+import multiprocessing
+
+from browserforge.fingerprints import FingerprintGenerator, Screen
+
+if __name__ == '__main__':
+    multiprocessing.set_start_method('spawn')
+    generator = FingerprintGenerator(
+        browser='chrome', device='desktop', screen=Screen(max_width=1920)
+    )
+    fingerprints = generator.generate_many(4, workers=2)
+    assert len(fingerprints) == 4
+    for fingerprint in fingerprints:
+        assert fingerprint.screen.width <= 1920
+        assert 'Chrome' in fingerprint.navigator.userAgent
+'''
+
+
+def test_generate_many_spawn():
+    # Run in a fresh interpreter, since the start method can only be set once per process
+    subprocess.run([sys.executable, '-c', GENERATE_MANY_SPAWN], check=True, timeout=300)
+
+
+CONCURRENT_LOAD = '''
+from concurrent.futures import ThreadPoolExecutor
+
+from browserforge.fingerprints import generator
+from browserforge.fingerprints import FingerprintGenerator
+
+loaded = []
+
+
+class CountingNetwork(generator.BayesianNetwork):
+    def __init__(self, path):
+        loaded.append(path)
+        super().__init__(path)
+
+
+generator.BayesianNetwork = CountingNetwork
+with ThreadPoolExecutor(8) as executor:
+    for fingerprint in executor.map(lambda _: FingerprintGenerator().generate(), range(8)):
+        assert fingerprint.navigator.userAgent
+assert len(loaded) == 1, loaded
+'''
+
+
+def test_network_loads_once_from_concurrent_threads():
+    # Run in a fresh interpreter, so the network isn't loaded yet
+    subprocess.run([sys.executable, '-c', CONCURRENT_LOAD], check=True, timeout=300)
+
+
+DUMPS_WITHOUT_ORJSON = '''
+import json
+import sys
+import warnings
+
+sys.modules['orjson'] = None
+from browserforge.fingerprints import FingerprintGenerator
+
+fingerprint = FingerprintGenerator().generate()
+with warnings.catch_warnings(record=True) as caught:
+    warnings.simplefilter('always')
+    for _ in range(3):
+        assert json.loads(fingerprint.dumps())['navigator']['userAgent']
+assert len(caught) == 1, caught
+'''
+
+
+def test_dumps_without_orjson_warns_once():
+    subprocess.run([sys.executable, '-c', DUMPS_WITHOUT_ORJSON], check=True, timeout=300)
+
+
+def test_partial_csp_values_are_immutable():
+    generator = FingerprintGenerator()
+    screen = Screen(max_width=1920)
+    first = generator.partial_csp(strict=True, screen=screen, filtered_values={})
+    # Tuples, so the values shared with the cached result can't be changed in place
+    assert all(isinstance(values, tuple) for values in first.values())
+    first['userAgent'] = ()
+    second = generator.partial_csp(strict=True, screen=screen, filtered_values={})
+    assert second['userAgent']
@@ -0,0 +1,38 @@
+import pickle
+import subprocess
+import sys
+
+from browserforge.headers import Browser, HeaderGenerator
+from browserforge.headers.generator import HttpBrowserObject
+
+
+def test_http_browser_object_pickle_round_trip():
+    browser = HttpBrowserObject('chrome', (1,), 'chrome/1|2', '2')
+    restored = pickle.loads(pickle.dumps(browser))
+    assert restored == browser
+    assert restored.is_http2
+
+
+def test_browser_is_mutable_and_cached_by_value():
+    browser = Browser(name='chrome', http_version=1)
+    assert HeaderGenerator(browser=[browser]).options['browsers'] == (browser,)
+    browser.name = 'firefox'
+    (prepared,) = HeaderGenerator(browser=[browser]).options['browsers']
+    assert prepared.name == 'firefox'
+    assert prepared.http_version == '1'
+
+
+CONCURRENT_LOAD = '''
+from concurrent.futures import ThreadPoolExecutor
+
+from browserforge.headers import HeaderGenerator
+
+with ThreadPoolExecutor(8) as executor:
+    for headers in executor.map(lambda _: HeaderGenerator().generate(), range(8)):
+        assert headers
+'''
+
+
+def test_networks_load_from_concurrent_threads():
+    # Run in a fresh interpreter, so the networks aren't loaded yet
+    subprocess.run([sys.executable, '-c', CONCURRENT_LOAD], check=True, timeout=300)
@@ -0,0 +1,9 @@
+from browserforge.fingerprints import FingerprintGenerator
+from browserforge.injectors.utils import InjectFunction
+
+
+def test_inject_function_reflects_fingerprint_changes():
+    fingerprint = FingerprintGenerator().generate()
+    InjectFunction(fingerprint)
+    fingerprint.navigator.userAgent = 'Mozilla/5.0 (changed)'
+    assert 'Mozilla/5.0 (changed)' in InjectFunction(fingerprint)